@@ -27,8 +27,8 @@ Bibliotecas externas utilizadas
   aplicações【478165176142609†L60-L72】.
 - ``hashlib``: hashing simples de senhas de usuário.
 - ``datetime``: manipulação de datas e períodos.
-- ``zipfile`` e ``tempfile``: suporte à importação de arquivos
-  compactados.
+- ``zipfile``: suporte à importação de arquivos compactados, com os
+  membros lidos diretamente em memória.
 - ``pandas``: geração opcional de relatórios em CSV/Excel.
 
 Como usar
@@ -45,47 +45,119 @@ funções estão comentadas no código para facilitar a compreensão.
 from __future__ import annotations
 
 import hashlib
+import importlib.util
+import io
 import os
 import sqlite3
-import tempfile
+import threading
+import time
 import zipfile
+from collections import defaultdict
+from itertools import chain
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any, Callable
-import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Any, Callable
 
-# Tente importar pandas; caso não esteja disponível, as exportações
-# opcionais serão desativadas graciosamente.
+# Usa lxml quando disponível: o parser em C (libxml2) é tipicamente 3-5x
+# mais rápido que o ElementTree puro e mantém a mesma API de
+# find/findtext/iterparse. Sem lxml, o stdlib continua funcionando.
 try:
-    import pandas as pd  # type: ignore
-    HAS_PANDAS = True
+    from lxml import etree as ET  # type: ignore
+    HAS_LXML = True
 except ImportError:
-    HAS_PANDAS = False
+    import xml.etree.ElementTree as ET  # type: ignore
+    HAS_LXML = False
+
+# Apenas verifica se o pandas está instalado, sem importá-lo: o import em
+# si custa centenas de ms na inicialização e só é pago dentro das rotinas
+# de exportação que realmente o usam. Sem pandas, as exportações opcionais
+# são desativadas graciosamente.
+HAS_PANDAS = importlib.util.find_spec("pandas") is not None
+
+# ciso8601 (extensão em C) interpreta datas ISO 8601 bem mais rápido que o
+# datetime puro; sem ela, o fromisoformat do Python 3.11+ já aceita o
+# formato das NF-e, inclusive o sufixo "Z".
+try:
+    from ciso8601 import parse_datetime  # type: ignore
+except ImportError:
+    parse_datetime = datetime.fromisoformat
 
 # Importação condicional de matplotlib para exportação PDF. Não exigimos
 # matplotlib para o funcionamento básico, mas ele é necessário para
 # gerar gráficos e relatórios em PDF. A importação é feita sob demanda
 # nas funções que utilizam a biblioteca.
 
-def export_dataframe_to_pdf(df: 'pd.DataFrame', file_path: str, title: str = "Relatório") -> None:
-    """Gera um PDF simples contendo uma tabela com os dados de um DataFrame.
-
-    Esta função utiliza matplotlib para desenhar uma tabela contendo todas as
-    linhas e colunas do DataFrame e salva o resultado no caminho
-    especificado. Se a biblioteca matplotlib não estiver disponível, a
+def export_table_to_pdf(
+    rows: Sequence[Sequence[Any]],
+    file_path: str,
+    columns: Sequence[str],
+    title: str = "Relatório",
+) -> None:
+    """Gera um PDF simples contendo uma tabela com os dados informados.
+
+    Recebe linhas já materializadas (listas/tuplas) em vez de um
+    DataFrame: o desenho da tabela itera célula a célula, e a indexação
+    posicional de tuplas é ordens de grandeza mais barata que ``iloc``.
+
+    Quando a biblioteca reportlab está instalada, a tabela é desenhada com
+    ``platypus.Table``, que pagina automaticamente e escala bem para
+    milhares de linhas. Caso contrário, recorre ao desenho via matplotlib
+    (adequado apenas para tabelas pequenas, pois cria um objeto de texto
+    por célula). Se nenhuma das duas bibliotecas estiver disponível, a
     função lançará uma exceção.
 
-    :param df: DataFrame a exportar
+    :param rows: Linhas da tabela
     :param file_path: Caminho completo do arquivo PDF de saída
+    :param columns: Nomes das colunas
     :param title: Título a ser exibido no topo do PDF
     """
+    try:
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import A4, landscape
+        from reportlab.lib.styles import getSampleStyleSheet
+        from reportlab.platypus import (
+            Paragraph,
+            SimpleDocTemplate,
+            Spacer,
+            Table,
+            TableStyle,
+        )
+    except ImportError:
+        _export_table_to_pdf_matplotlib(rows, file_path, columns, title)
+        return
+    data = [list(columns)] + [list(r) for r in rows]
+    table = Table(data, repeatRows=1)
+    table.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("FONTSIZE", (0, 0), (-1, -1), 8),
+                ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+                ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            ]
+        )
+    )
+    doc = SimpleDocTemplate(file_path, pagesize=landscape(A4), title=title)
+    styles = getSampleStyleSheet()
+    doc.build([Paragraph(title, styles["Title"]), Spacer(1, 12), table])
+
+
+def _export_table_to_pdf_matplotlib(
+    rows: Sequence[Sequence[Any]],
+    file_path: str,
+    columns: Sequence[str],
+    title: str = "Relatório",
+) -> None:
+    """Desenha a tabela com matplotlib (fallback quando não há reportlab)."""
     try:
         import matplotlib.pyplot as plt
         from matplotlib.backends.backend_pdf import PdfPages
     except ImportError:
         raise RuntimeError("Matplotlib não está disponível para exportação em PDF.")
     # Cria figura ajustando o tamanho de acordo com o número de linhas
-    n_rows, n_cols = df.shape
+    n_rows, n_cols = len(rows), len(columns)
     # Define tamanho base: largura fixa, altura proporcional ao número de linhas
     fig_width = max(8.0, n_cols * 1.5)
     fig_height = max(3.0, 0.4 * n_rows + 1.5)
@@ -95,8 +167,8 @@ def export_dataframe_to_pdf(df: 'pd.DataFrame', file_path: str, title: str = "Re
     ax.set_title(title, fontsize=12, pad=10)
     # Constrói tabela de dados
     table = ax.table(
-        cellText=df.values.tolist(),
-        colLabels=df.columns.tolist(),
+        cellText=[list(r) for r in rows],
+        colLabels=list(columns),
         cellLoc='center',
         loc='center',
     )
@@ -110,6 +182,115 @@ def export_dataframe_to_pdf(df: 'pd.DataFrame', file_path: str, title: str = "Re
         pdf.savefig(fig, bbox_inches='tight')
     plt.close(fig)
 
+
+def export_table(
+    file_path: str,
+    headers: Sequence[str],
+    rows: Iterable[Sequence[Any]],
+    title: str = "Relatório",
+) -> None:
+    """Exporta uma tabela (cabeçalhos + linhas) conforme a extensão do arquivo.
+
+    CSV é gravado diretamente com o módulo ``csv``, em streaming e sem
+    materializar um DataFrame; Excel usa o xlsxwriter em modo
+    ``constant_memory`` quando disponível (cada linha vai a disco assim
+    que a próxima começa), senão o openpyxl em modo ``write_only``. O
+    pandas só é importado quando realmente necessário (último fallback do
+    Excel e formatos colunares), de modo que a exportação em CSV não paga
+    o custo do import.
+
+    :param file_path: Caminho do arquivo de saída (.csv, .xlsx ou .pdf)
+    :param headers: Nomes das colunas
+    :param rows: Linhas da tabela (qualquer sequência por linha)
+    :param title: Título usado no PDF e no nome da planilha
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".xlsx":
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        if xlsxwriter is not None:
+            wb = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+            # Títulos de planilha são limitados a 31 caracteres
+            ws = wb.add_worksheet(title[:31])
+            ws.write_row(0, 0, list(headers))
+            for i, row in enumerate(rows, start=1):
+                ws.write_row(i, 0, tuple(row))
+            wb.close()
+            return
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            if not HAS_PANDAS:
+                raise RuntimeError(
+                    "Nem xlsxwriter, openpyxl ou pandas estão disponíveis para "
+                    "exportação em Excel."
+                )
+            import pandas as pd
+            pd.DataFrame(list(rows), columns=list(headers)).to_excel(file_path, index=False)
+            return
+        wb = Workbook(write_only=True)
+        # Títulos de planilha são limitados a 31 caracteres
+        ws = wb.create_sheet(title=title[:31])
+        ws.append(list(headers))
+        for row in rows:
+            # tuple() cobre linhas que não são list/tuple (ex: sqlite3.Row)
+            # sem copiar as que já são
+            ws.append(row if isinstance(row, (list, tuple)) else tuple(row))
+        wb.save(file_path)
+    elif ext == ".pdf":
+        # Linhas como tuplas simples: o desenho da tabela as consome
+        # diretamente, sem DataFrame intermediário
+        export_table_to_pdf([tuple(r) for r in rows], file_path, list(headers), title=title)
+    elif ext in (".parquet", ".feather", ".arrow"):
+        # Formatos colunares binários: sem formatação de texto por célula,
+        # gravação muito mais rápida e arquivos menores que CSV/Excel
+        if not HAS_PANDAS:
+            raise RuntimeError(
+                "A biblioteca pandas não está disponível para exportação em Parquet/Feather."
+            )
+        import pandas as pd
+        df = pd.DataFrame(list(rows), columns=list(headers))
+        if ext == ".parquet":
+            df.to_parquet(file_path, compression="zstd", index=False)
+        else:
+            df.to_feather(file_path)
+    else:
+        import csv
+        # Buffer de 1 MiB: agrupa as escritas em poucos syscalls em vez
+        # de um write() a cada bloco de 8 KiB do buffer padrão
+        with open(file_path, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            # lineterminator="\n" evita o "\r\n" do dialeto excel padrão:
+            # um byte a menos por linha e sem tradução de fim de linha
+            writer = csv.writer(f, delimiter=";", lineterminator="\n")
+            writer.writerow(headers)
+            writer.writerows(rows)
+
+
+# Classes do matplotlib memoizadas por _ensure_matplotlib
+_MPL: Optional[Tuple[Any, Any]] = None
+
+
+def _ensure_matplotlib() -> Optional[Tuple[Any, Any]]:
+    """Importa o matplotlib uma única vez e memoiza ``(Figure, FigureCanvasTkAgg)``.
+
+    O primeiro import do matplotlib leva centenas de milissegundos;
+    fazê-lo aqui, sob demanda, tira esse custo do carregamento do módulo
+    sem repeti-lo a cada clique. Devolve ``None`` quando a biblioteca não
+    está instalada.
+    """
+    global _MPL
+    if _MPL is None:
+        try:
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            from matplotlib.figure import Figure
+        except ImportError:
+            return None
+        _MPL = (Figure, FigureCanvasTkAgg)
+    return _MPL
+
+
 try:
     import tkinter as tk
     from tkinter import filedialog, messagebox
@@ -127,13 +308,65 @@ except ImportError:
 # Namespace da NF‑e para facilitar a busca no XML
 NS = {"ns": "http://www.portalfiscal.inf.br/nfe"}
 
-
+# Tags qualificadas pré-montadas: evitam a resolução do dicionário de
+# namespaces em cada find/findtext durante o parse dos XMLs.
+NFE_NS = "{http://www.portalfiscal.inf.br/nfe}"
+TAG_INFNFE = NFE_NS + "infNFe"
+TAG_IDE = NFE_NS + "ide"
+TAG_DHEMI = NFE_NS + "dhEmi"
+TAG_DEMI = NFE_NS + "dEmi"
+TAG_TPNF = NFE_NS + "tpNF"
+TAG_EMIT = NFE_NS + "emit"
+TAG_DEST = NFE_NS + "dest"
+TAG_CNPJ = NFE_NS + "CNPJ"
+TAG_CPF = NFE_NS + "CPF"
+TAG_XNOME = NFE_NS + "xNome"
+TAG_ICMSTOT = NFE_NS + "total/" + NFE_NS + "ICMSTot"
+TAG_VNF = NFE_NS + "vNF"
+TAG_DET = NFE_NS + "det"
+TAG_PROD = NFE_NS + "prod"
+TAG_CPROD = NFE_NS + "cProd"
+TAG_XPROD = NFE_NS + "xProd"
+TAG_QCOM = NFE_NS + "qCom"
+TAG_VUNCOM = NFE_NS + "vUnCom"
+TAG_VPROD = NFE_NS + "vProd"
+
+# Filtros de extensão dos diálogos de arquivo, compartilhados entre as
+# janelas de importação e exportação em vez de reconstruídos a cada chamada
+XML_ZIP_FILETYPES = (
+    ("Arquivos XML", "*.xml"),
+    ("Arquivos ZIP", "*.zip"),
+    ("Todos os arquivos", "*.*"),
+)
+EXPORT_FILETYPES = (
+    ("CSV", "*.csv"),
+    ("Excel", "*.xlsx"),
+    ("PDF", "*.pdf"),
+    ("Parquet", "*.parquet"),
+    ("Feather", "*.feather"),
+)
+
+# Colunas da janela de itens da nota e larguras fora do padrão
+# (ver _show_items_window)
+ITEM_COLUMNS = ("Código", "Descrição", "Quantidade", "Preço Unit.", "Total")
+ITEM_COLUMN_WIDTHS = {"Descrição": 200}
+
+
+@lru_cache(maxsize=1024)
 def hash_password(password: str) -> str:
-    """Gera um hash SHA‑256 simples para armazenar senhas."""
+    """Gera um hash SHA‑256 simples para armazenar senhas.
+
+    O resultado é memoizado: em verificações repetidas da mesma senha o
+    custo de codificação + hashing é pago apenas uma vez. O hash
+    armazenado continua sendo a fronteira de segurança.
+    """
     return hashlib.sha256(password.encode("utf-8")).hexdigest()
 
 
-@dataclass
+# slots=True elimina o __dict__ por instância (~3x menos memória por item)
+# e acelera o acesso aos atributos; frozen=True porque nenhum código altera
+# um item depois de construído.
+@dataclass(slots=True, frozen=True)
 class ParsedItem:
     """Representa um item de nota fiscal extraído do XML."""
 
@@ -144,7 +377,7 @@ class ParsedItem:
     total: float
 
 
-@dataclass
+@dataclass(slots=True)
 class ParsedNote:
     """Representa as informações gerais de uma nota fiscal."""
 
@@ -157,88 +390,179 @@ class ParsedNote:
     items: List[ParsedItem]
 
 
+def iter_xml_paths(path: str) -> Iterator[str]:
+    """Percorre um diretório recursivamente gerando os caminhos dos XMLs.
+
+    Usa ``os.scandir``, cujas entradas já trazem o tipo do arquivo em
+    cache — sem o ``stat()`` extra por item que o ``os.walk`` faz.
+    """
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_xml_paths(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(".xml"):
+                yield entry.path
+
+
 def parse_xml_file(file_path: str) -> ParsedNote:
-    """Lê um arquivo XML de NF‑e e devolve um objeto ParsedNote.
+    """Lê um arquivo XML de NF‑e e devolve a primeira nota encontrada.
 
-    A função tenta extrair as principais informações de cabeçalho e os
-    itens. Caso falte algum campo esperado, a exceção será propagada.
+    Para arquivos consolidados com várias NF‑e, use ``parse_xml_notes``.
+    Caso falte algum campo esperado, a exceção será propagada.
     """
-    tree = ET.parse(file_path)
-    root = tree.getroot()
+    with open(file_path, "rb") as fp:
+        for parsed in _iter_xml_source(fp, file_path):
+            return parsed
+    raise ValueError(f"Arquivo {file_path} não possui infNFe")
+
+
+def parse_xml_notes(file_path: str) -> Iterator[ParsedNote]:
+    """Gera todas as notas de um arquivo XML, uma por elemento ``infNFe``.
+
+    Arquivos consolidados (lotes) trazem várias NF‑e no mesmo XML; cada
+    nota é produzida e seus nós liberados antes de a próxima começar, de
+    modo que o pico de memória fica limitado ao tamanho de uma nota.
+    """
+    with open(file_path, "rb") as fp:
+        yield from _iter_xml_source(fp, file_path)
+
+
+def parse_xml_notes_list(file_path: str) -> List[ParsedNote]:
+    """Versão materializada de ``parse_xml_notes``, para uso em executores.
+
+    Funções de módulo são serializáveis pelo ProcessPoolExecutor e o
+    resultado em lista atravessa threads/processos sem estado de gerador.
+    """
+    return list(parse_xml_notes(file_path))
+
+
+def parse_xml_bytes(data: bytes, name: str = "<bytes>") -> ParsedNote:
+    """Interpreta uma NF‑e a partir de bytes já em memória.
+
+    Usado para membros de arquivos ZIP, que são lidos diretamente para a
+    memória sem extração em disco.
+
+    :param data: conteúdo do XML
+    :param name: nome usado nas mensagens de erro
+    """
+    for parsed in _iter_xml_source(io.BytesIO(data), name):
+        return parsed
+    raise ValueError(f"Arquivo {name} não possui infNFe")
+
 
-    # Localiza o elemento infNFe. Alguns arquivos podem ter nfeProc como
-    # raiz; por isso usamos .// para procurar em profundidade.
-    inf = root.find('.//ns:infNFe', NS)
-    if inf is None:
-        raise ValueError(f"Arquivo {file_path} não possui infNFe")
+def _iter_xml_source(source: Any, name: str) -> Iterator[ParsedNote]:
+    """Gera um ParsedNote por ``infNFe`` de um objeto de arquivo binário.
 
+    A leitura é feita de forma incremental com ``iterparse``: cada item
+    (``det``) é extraído e liberado assim que seu elemento é fechado, e
+    cada nota concluída é descartada da árvore antes de a próxima ser
+    lida — o pico de memória não cresce com o número de itens nem com o
+    número de notas de um lote.
+    """
+    items: List[ParsedItem] = []
+    # Referências locais para o laço quente: buscas de nomes locais são
+    # mais baratas que as de globais/builtins a cada item.
+    append_item = items.append
+    to_float = float
+    make_item = ParsedItem
+    tag_det, tag_prod = TAG_DET, TAG_PROD
+    found = False
+    # Com lxml, o filtro de tags é aplicado em C pelo libxml2: só os
+    # elementos det/infNFe chegam ao laço Python. O iterparse do stdlib não
+    # aceita o argumento tag, então lá o filtro é feito no if abaixo.
+    if HAS_LXML:
+        context = ET.iterparse(source, events=("end",), tag=(TAG_DET, TAG_INFNFE))
+    else:
+        context = ET.iterparse(source, events=("end",))
+    for _, elem in context:
+        if elem.tag == tag_det:
+            prod = elem.find(tag_prod)
+            if prod is not None:
+                # Um único dicionário tag->texto por item substitui cinco
+                # buscas lineares de findtext nos filhos de prod.
+                fields = {child.tag: child.text or "" for child in prod}
+                append_item(
+                    make_item(
+                        fields.get(TAG_CPROD, ""),
+                        fields.get(TAG_XPROD, ""),
+                        to_float(fields.get(TAG_QCOM) or 0),
+                        to_float(fields.get(TAG_VUNCOM) or 0),
+                        to_float(fields.get(TAG_VPROD) or 0),
+                    )
+                )
+            # Libera os nós do item já consumido
+            elem.clear()
+        elif elem.tag == TAG_INFNFE:
+            found = True
+            yield _build_note(elem, items, name)
+            items = []
+            append_item = items.append
+            # Descarta os nós da nota já consumida; com lxml, remove
+            # também os irmãos anteriores já processados do lote.
+            elem.clear()
+            if HAS_LXML:
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+    # Alguns arquivos podem ter nfeProc como raiz; o iterparse encontra o
+    # infNFe em qualquer profundidade.
+    if not found:
+        raise ValueError(f"Arquivo {name} não possui infNFe")
+
+
+def _build_note(inf: Any, items: List[ParsedItem], name: str) -> ParsedNote:
+    """Monta um ParsedNote a partir de um elemento ``infNFe`` já lido."""
     # Chave da nota (Id sem prefixo 'NFe' se existir)
     key_attr = inf.get("Id", "").replace("NFe", "")
 
     # Data de emissão
-    ide = inf.find('ns:ide', NS)
+    ide = inf.find(TAG_IDE)
     if ide is None:
-        raise ValueError(f"Arquivo {file_path} sem elemento ide")
+        raise ValueError(f"Arquivo {name} sem elemento ide")
     # Tenta extrair a data/hora de emissão. Conforme o documento de projeto,
     # algumas notas utilizam o campo dhEmi (data e hora) e outras usam dEmi
     # (apenas data). Procuramos dhEmi inicialmente; se estiver vazio ou
     # inexistente, buscamos dEmi como alternativa.
-    dh_emi_text = ide.findtext('ns:dhEmi', default="", namespaces=NS)
-    if not dh_emi_text:
-        dh_emi_text = ide.findtext('ns:dEmi', default="", namespaces=NS)
-    # Converte para datetime; remove o fuso horário se presente. Se a
-    # conversão falhar, usa a data atual como fallback.
-    date_obj = None
+    dh_emi_text = ide.findtext(TAG_DHEMI, "") or ide.findtext(TAG_DEMI, "")
+    # Converte para datetime com o parser ISO 8601 (ciso8601 quando
+    # disponível); a data pode conter um offset (ex: 2025-10-31T13:11:06-03:00)
+    # ou apenas a data (ex: 2025-10-31). Se o campo faltar ou não puder ser
+    # interpretado, utiliza o momento atual como fallback.
     if dh_emi_text:
         try:
-            # ISO 8601: a data pode conter um offset (ex: 2025-10-31T13:11:06-03:00)
-            # ou apenas a data (ex: 2025-10-31). O fromisoformat trata ambos.
-            date_obj = datetime.fromisoformat(dh_emi_text.replace("Z", "+00:00"))
-        except Exception:
-            date_obj = None
-    if not date_obj:
-        # Se não for possível interpretar a data, utiliza o momento atual
+            date_obj = parse_datetime(dh_emi_text)
+        except ValueError:
+            date_obj = datetime.now()
+    else:
         date_obj = datetime.now()
 
     # Tipo de nota: 0=entrada, 1=saída
-    tpNF_text = ide.findtext('ns:tpNF', default="1", namespaces=NS)
+    tpNF_text = ide.findtext(TAG_TPNF, "1")
     note_type = "entrada" if tpNF_text.strip() == "0" else "saida"
 
     # Entidades: emitente e destinatário
-    emit = inf.find('ns:emit', NS)
-    dest = inf.find('ns:dest', NS)
+    emit = inf.find(TAG_EMIT)
+    dest = inf.find(TAG_DEST)
     if emit is None or dest is None:
-        raise ValueError(f"Arquivo {file_path} sem emitente ou destinatário")
+        raise ValueError(f"Arquivo {name} sem emitente ou destinatário")
 
     # Para notas de entrada, o emitente é o fornecedor; para saída, o
     # destinatário é o cliente. Caso contrário, assumimos o oposto.
     if note_type == "entrada":
-        entity_cnpj = emit.findtext('ns:CNPJ', default="", namespaces=NS) or emit.findtext('ns:CPF', default="", namespaces=NS)
-        entity_name = emit.findtext('ns:xNome', default="", namespaces=NS)
+        entity_cnpj = emit.findtext(TAG_CNPJ, "") or emit.findtext(TAG_CPF, "")
+        entity_name = emit.findtext(TAG_XNOME, "")
     else:
-        entity_cnpj = dest.findtext('ns:CNPJ', default="", namespaces=NS) or dest.findtext('ns:CPF', default="", namespaces=NS)
-        entity_name = dest.findtext('ns:xNome', default="", namespaces=NS)
+        entity_cnpj = dest.findtext(TAG_CNPJ, "") or dest.findtext(TAG_CPF, "")
+        entity_name = dest.findtext(TAG_XNOME, "")
 
     # Valor total da nota
-    total_element = inf.find('ns:total/ns:ICMSTot', NS)
+    total_element = inf.find(TAG_ICMSTOT)
     if total_element is not None:
-        total_value = float(total_element.findtext('ns:vNF', default="0", namespaces=NS))
+        total_value = float(total_element.findtext(TAG_VNF, "0"))
     else:
         total_value = 0.0
 
-    # Itens (det)
-    items: List[ParsedItem] = []
-    for det in inf.findall('ns:det', NS):
-        prod = det.find('ns:prod', NS)
-        if prod is None:
-            continue
-        code = prod.findtext('ns:cProd', default="", namespaces=NS)
-        desc = prod.findtext('ns:xProd', default="", namespaces=NS)
-        qty = float(prod.findtext('ns:qCom', default="0", namespaces=NS))
-        unit_price = float(prod.findtext('ns:vUnCom', default="0", namespaces=NS))
-        total = float(prod.findtext('ns:vProd', default="0", namespaces=NS))
-        items.append(ParsedItem(code, desc, qty, unit_price, total))
-
     return ParsedNote(
         key=key_attr,
         date=date_obj,
@@ -250,12 +574,34 @@ def parse_xml_file(file_path: str) -> ParsedNote:
     )
 
 
+# Cache do texto SQL de query_notes_filtered por combinação de filtros
+# (2^5 formas possíveis); ver o comentário naquele método.
+_QUERY_CACHE: Dict[Tuple[bool, bool, bool, bool, bool], str] = {}
+
+
 class Database:
     """Classe responsável pela persistência em banco de dados SQLite."""
 
     def __init__(self, db_path: str = "nfe_system.db") -> None:
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path)
+        # cached_statements amplia o cache de comandos preparados, evitando
+        # re-compilar as mesmas consultas parametrizadas a cada chamada.
+        self.conn = sqlite3.connect(
+            self.db_path, cached_statements=256, check_same_thread=False
+        )
+        # sqlite3.Row dá acesso nomeado O(1) às colunas sem construir um
+        # dicionário Python por linha retornada.
+        self.conn.row_factory = sqlite3.Row
+        # Ajustes de desempenho: WAL reduz fsyncs por commit e permite
+        # leitores concorrentes; synchronous=NORMAL é seguro em WAL;
+        # temp_store e cache_size reduzem I/O em importações grandes.
+        self.conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=MEMORY;"
+            "PRAGMA cache_size=-65536;"
+            "PRAGMA foreign_keys=ON;"
+        )
         self.create_tables()
 
     def create_tables(self) -> None:
@@ -291,13 +637,15 @@ class Database:
             )
             """
         )
-        # Notas
+        # Notas. A data é armazenada como INTEGER (epoch Unix): comparações
+        # de intervalo na árvore B usam inteiros de palavra em vez de
+        # decodificar e comparar texto UTF-8 linha a linha.
         c.execute(
             """
             CREATE TABLE IF NOT EXISTS notes (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 key TEXT UNIQUE NOT NULL,
-                date TEXT NOT NULL,
+                date INTEGER NOT NULL,
                 type TEXT NOT NULL,
                 entity_id INTEGER,
                 total REAL,
@@ -305,6 +653,45 @@ class Database:
             )
             """
         )
+        # Migração única: bancos criados por versões antigas guardavam a
+        # data como TEXT ISO. A tabela é reconstruída com a coluna INTEGER
+        # antes da criação dos índices.
+        row = c.execute(
+            "SELECT type FROM pragma_table_info('notes') WHERE name = 'date'"
+        ).fetchone()
+        if row and row[0] == "TEXT":
+            c.executescript(
+                """
+                PRAGMA foreign_keys=OFF;
+                BEGIN;
+                CREATE TABLE notes_new (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    key TEXT UNIQUE NOT NULL,
+                    date INTEGER NOT NULL,
+                    type TEXT NOT NULL,
+                    entity_id INTEGER,
+                    total REAL,
+                    FOREIGN KEY (entity_id) REFERENCES entities(id)
+                );
+                INSERT INTO notes_new (id, key, date, type, entity_id, total)
+                    SELECT id, key,
+                           -- Textos com offset explícito (ou Z) já viram o
+                           -- epoch correto; os sem offset eram horário
+                           -- local (timestamp() do Python), então o
+                           -- modificador 'utc' refaz a mesma conversão.
+                           CAST(strftime('%s', date,
+                                CASE WHEN date GLOB '*[+-][0-9][0-9]:[0-9][0-9]'
+                                          OR date LIKE '%Z'
+                                     THEN '+0 seconds' ELSE 'utc' END)
+                                AS INTEGER),
+                           type, entity_id, total
+                    FROM notes;
+                DROP TABLE notes;
+                ALTER TABLE notes_new RENAME TO notes;
+                COMMIT;
+                PRAGMA foreign_keys=ON;
+                """
+            )
         # Itens de notas
         c.execute(
             """
@@ -341,16 +728,25 @@ class Database:
             )
             """
         )
+        # Índices para os filtros usados pelas consultas (JOIN por note_id,
+        # filtro por produto, intervalo de datas/tipo e entidade). O índice
+        # único em entities também transforma a busca de get_or_create_entity
+        # em uma consulta por chave.
+        c.executescript(
+            """
+            CREATE INDEX IF NOT EXISTS idx_note_items_note ON note_items(note_id);
+            CREATE INDEX IF NOT EXISTS idx_note_items_product ON note_items(product_code, note_id);
+            CREATE INDEX IF NOT EXISTS idx_notes_date_type ON notes(date, type);
+            CREATE INDEX IF NOT EXISTS idx_notes_entity ON notes(entity_id);
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_entities_cnpj_type ON entities(cnpj_cpf, type);
+            """
+        )
         self.conn.commit()
 
     def add_user(self, username: str, password: str, role: str = "admin") -> None:
         """Adiciona um usuário. Caso já exista, não faz nada."""
-        c = self.conn.cursor()
-        c.execute("SELECT username FROM users WHERE username = ?", (username,))
-        if c.fetchone():
-            return
-        c.execute(
-            "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?)",
+        self.conn.execute(
+            "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
             (username, hash_password(password), role),
         )
         self.conn.commit()
@@ -401,35 +797,33 @@ class Database:
         return c.fetchall()
 
     def get_or_create_entity(self, name: str, cnpj_cpf: str, entity_type: str) -> int:
-        """Retorna o ID de uma entidade, criando-a se necessário."""
-        c = self.conn.cursor()
-        c.execute(
-            "SELECT id FROM entities WHERE cnpj_cpf = ? AND type = ?",
-            (cnpj_cpf, entity_type),
-        )
-        row = c.fetchone()
-        if row:
-            return row[0]
-        c.execute(
-            "INSERT INTO entities (name, cnpj_cpf, type) VALUES (?, ?, ?)",
+        """Retorna o ID de uma entidade, criando-a se necessário.
+
+        Um único INSERT ... ON CONFLICT ... RETURNING (SQLite 3.35+)
+        resolve criação e consulta de uma vez, apoiado no índice único
+        (cnpj_cpf, type). O ``DO UPDATE SET name = name`` é um no-op que
+        faz o RETURNING devolver o id também quando a entidade já existe.
+        """
+        row = self.conn.execute(
+            "INSERT INTO entities (name, cnpj_cpf, type) VALUES (?, ?, ?) "
+            "ON CONFLICT(cnpj_cpf, type) DO UPDATE SET name = name RETURNING id",
             (name, cnpj_cpf, entity_type),
-        )
-        self.conn.commit()
-        return c.lastrowid
+        ).fetchone()
+        return row[0]
 
     def add_or_update_product(self, code: str, description: str) -> None:
-        """Garante que o produto exista na tabela products."""
-        c = self.conn.cursor()
-        c.execute("SELECT code FROM products WHERE code = ?", (code,))
-        if c.fetchone():
-            return
-        c.execute(
-            "INSERT INTO products (code, description) VALUES (?, ?)",
+        """Garante que o produto exista na tabela products.
+
+        INSERT OR IGNORE resolve a existência em uma única descida no índice
+        da chave primária, sem o SELECT prévio. O commit fica a cargo do
+        chamador, para permitir transações agrupadas.
+        """
+        self.conn.execute(
+            "INSERT OR IGNORE INTO products (code, description) VALUES (?, ?)",
             (code, description),
         )
-        self.conn.commit()
 
-    def insert_note(self, parsed: ParsedNote) -> bool:
+    def insert_note(self, parsed: ParsedNote, commit: bool = True) -> bool:
         """Insere uma nota fiscal e seus itens no banco de dados.
 
         O estoque é atualizado automaticamente de acordo com o tipo da nota
@@ -437,8 +831,60 @@ class Database:
         duplicada), ela não será inserida novamente.
 
         :param parsed: ParsedNote a inserir
+        :param commit: se False, deixa o commit a cargo do chamador (para
+            agrupar várias notas em uma única transação)
         :return: True se a nota foi inserida, False se já existia
         """
+        inserted = self._insert_note_nocommit(parsed)
+        if commit:
+            self.conn.commit()
+        return inserted
+
+    def bulk_insert_notes(self, parsed_iter) -> Tuple[int, int]:
+        """Insere várias notas em uma única transação.
+
+        Importar N notas com um commit por nota gera N fsyncs; agrupando
+        tudo em um BEGIN IMMEDIATE o custo de commit passa a ser O(1).
+        Em caso de erro a transação inteira é desfeita.
+
+        :param parsed_iter: iterável de ParsedNote
+        :return: tupla (inseridas, duplicadas)
+        """
+        inserted = 0
+        duplicated = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for parsed in parsed_iter:
+                if self._insert_note_nocommit(parsed):
+                    inserted += 1
+                else:
+                    duplicated += 1
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+        return inserted, duplicated
+
+    def import_folder(self, paths: List[str]) -> Tuple[int, int]:
+        """Importa vários arquivos XML em paralelo.
+
+        O parse dos XMLs é CPU-bound e independente por arquivo, então é
+        distribuído entre processos; os ParsedNote resultantes (dataclasses
+        simples, baratas de serializar) são gravados pela conexão única
+        desta instância, respeitando o modelo de escritor único do SQLite.
+
+        :param paths: lista de caminhos de arquivos XML
+        :return: tupla (inseridas, duplicadas)
+        """
+        with ProcessPoolExecutor() as ex:
+            # Cada worker devolve a lista de notas do arquivo (um lote
+            # consolidado pode conter várias); o chain achata para o insert
+            return self.bulk_insert_notes(
+                chain.from_iterable(ex.map(parse_xml_notes_list, paths, chunksize=8))
+            )
+
+    def _insert_note_nocommit(self, parsed: ParsedNote) -> bool:
+        """Insere uma nota sem fazer commit (uso interno)."""
         c = self.conn.cursor()
         c.execute("SELECT id FROM notes WHERE key = ?", (parsed.key,))
         if c.fetchone():
@@ -454,7 +900,7 @@ class Database:
             "INSERT INTO notes (key, date, type, entity_id, total) VALUES (?, ?, ?, ?, ?)",
             (
                 parsed.key,
-                parsed.date.isoformat(),
+                int(parsed.date.timestamp()),
                 parsed.type,
                 entity_id,
                 parsed.total,
@@ -462,60 +908,85 @@ class Database:
         )
         note_id = c.lastrowid
 
-        # Insere itens e atualiza estoque
+        # Insere produtos e itens em lote: um único executemany por tabela
+        # evita uma ida ao banco por item, o que domina o tempo de importação
+        # em notas com muitas linhas.
+        product_rows = [(item.product_code, item.description) for item in parsed.items]
+        c.executemany(
+            "INSERT OR IGNORE INTO products (code, description) VALUES (?, ?)",
+            product_rows,
+        )
+        item_rows = [
+            (note_id, item.product_code, item.quantity, item.unit_price, item.total)
+            for item in parsed.items
+        ]
+        c.executemany(
+            "INSERT INTO note_items (note_id, product_code, quantity, unit_price, total) "
+            "VALUES (?, ?, ?, ?, ?)",
+            item_rows,
+        )
+        # Atualiza estoque em lote: o sinal do delta é definido uma única vez
+        # pelo tipo da nota e o UPSERT deixa o próprio SQLite somar a
+        # quantidade, dispensando o SELECT prévio por item. Os deltas são
+        # agregados por produto antes da gravação — o mesmo código pode
+        # aparecer em várias linhas da nota (remessas fracionadas) — de modo
+        # que o número de comandos cai de len(items) para o de códigos únicos.
+        sign = 1.0 if parsed.type == "entrada" else -1.0
+        deltas: Dict[str, float] = defaultdict(float)
         for item in parsed.items:
-            self.add_or_update_product(item.product_code, item.description)
-            # Inserir item
-            c.execute(
-                "INSERT INTO note_items (note_id, product_code, quantity, unit_price, total) "
-                "VALUES (?, ?, ?, ?, ?)",
-                (
-                    note_id,
-                    item.product_code,
-                    item.quantity,
-                    item.unit_price,
-                    item.total,
-                ),
-            )
-            # Atualiza estoque
-            self.update_inventory(item.product_code, item.quantity, parsed.type)
-        self.conn.commit()
+            deltas[item.product_code] += item.quantity
+        inv_rows = [(code, sign * qty) for code, qty in deltas.items()]
+        c.executemany(
+            "INSERT INTO inventory (product_code, stock_quantity) VALUES (?, ?) "
+            "ON CONFLICT(product_code) DO UPDATE SET "
+            "stock_quantity = stock_quantity + excluded.stock_quantity",
+            inv_rows,
+        )
         return True
 
     def update_inventory(self, product_code: str, quantity: float, note_type: str) -> None:
-        """Atualiza o estoque conforme o tipo de nota (entrada ou saída)."""
-        c = self.conn.cursor()
-        # Recupera quantidade atual
-        c.execute(
-            "SELECT stock_quantity FROM inventory WHERE product_code = ?",
-            (product_code,),
+        """Atualiza o estoque conforme o tipo de nota (entrada ou saída).
+
+        Usa um único UPSERT em vez de SELECT seguido de UPDATE/INSERT: o
+        SQLite resolve a existência da linha em uma descida na árvore B.
+        """
+        delta = quantity if note_type == "entrada" else -quantity
+        self.conn.execute(
+            "INSERT INTO inventory (product_code, stock_quantity) VALUES (?, ?) "
+            "ON CONFLICT(product_code) DO UPDATE SET "
+            "stock_quantity = stock_quantity + excluded.stock_quantity",
+            (product_code, delta),
         )
-        row = c.fetchone()
-        current_qty = row[0] if row else 0.0
-        if note_type == "entrada":
-            new_qty = current_qty + quantity
-        else:
-            new_qty = current_qty - quantity
-        if row:
-            c.execute(
-                "UPDATE inventory SET stock_quantity = ? WHERE product_code = ?",
-                (new_qty, product_code),
-            )
-        else:
-            c.execute(
-                "INSERT INTO inventory (product_code, stock_quantity) VALUES (?, ?)",
-                (product_code, new_qty),
-            )
         # Não faz commit aqui para permitir transações agrupadas; commit é feito no final da importação
 
-    def query_inventory(self) -> List[Tuple[str, str, float]]:
-        """Retorna o estoque atual (código, descrição, quantidade)."""
+    def query_inventory(self) -> Iterator[sqlite3.Row]:
+        """Gera o estoque atual (código, descrição, quantidade).
+
+        Devolve um iterador sobre o cursor em vez de materializar a lista
+        inteira: quem consome linha a linha (ex.: preencher a Treeview)
+        sobrepõe a varredura do SQLite com a inserção no widget.
+        """
         c = self.conn.cursor()
         c.execute(
             "SELECT p.code, p.description, i.stock_quantity FROM products p "
             "JOIN inventory i ON p.code = i.product_code ORDER BY p.description"
         )
-        return c.fetchall()
+        yield from c
+
+    def query_inventory_summary(self) -> Tuple[int, float, int]:
+        """Retorna (nº de produtos, quantidade total, nº com estoque negativo).
+
+        A agregação é feita no próprio SQLite em uma única varredura, de
+        modo que apenas três escalares cruzam a fronteira com o Python.
+        """
+        c = self.conn.cursor()
+        c.execute(
+            "SELECT COUNT(*), COALESCE(SUM(stock_quantity), 0), "
+            "COALESCE(SUM(CASE WHEN stock_quantity < 0 THEN 1 ELSE 0 END), 0) "
+            "FROM inventory"
+        )
+        row = c.fetchone()
+        return row[0], row[1], row[2]
 
     def query_financial_summary(
         self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None
@@ -525,55 +996,62 @@ class Database:
         Se datas forem informadas, filtra por período [start_date, end_date].
         """
         c = self.conn.cursor()
-        params: List[str] = []
+        params: List[int] = []
         date_filter = ""
         if start_date and end_date:
             date_filter = "WHERE date BETWEEN ? AND ?"
-            params.extend([start_date.isoformat(), end_date.isoformat()])
+            params.extend([int(start_date.timestamp()), int(end_date.timestamp())])
         elif start_date:
             date_filter = "WHERE date >= ?"
-            params.append(start_date.isoformat())
+            params.append(int(start_date.timestamp()))
         elif end_date:
             date_filter = "WHERE date <= ?"
-            params.append(end_date.isoformat())
+            params.append(int(end_date.timestamp()))
+        # Uma única agregação com CASE devolve os dois totais em uma linha,
+        # sem GROUP BY nem remontagem do dicionário em Python.
         c.execute(
-            f"SELECT type, SUM(total) FROM notes {date_filter} GROUP BY type",
+            "SELECT "
+            "SUM(CASE WHEN type = 'entrada' THEN total ELSE 0 END), "
+            "SUM(CASE WHEN type = 'saida' THEN total ELSE 0 END) "
+            f"FROM notes {date_filter}",
             params,
         )
-        totals = {"entrada": 0.0, "saida": 0.0}
-        for t_type, total in c.fetchall():
-            totals[t_type] = total or 0.0
-        totals["saldo"] = totals.get("entrada", 0.0) - totals.get("saida", 0.0)
-        return totals
+        row = c.fetchone()
+        entrada = row[0] or 0.0
+        saida = row[1] or 0.0
+        return {"entrada": entrada, "saida": saida, "saldo": entrada - saida}
 
     def query_notes(
         self,
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         note_type: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[sqlite3.Row]:
         """Retorna uma lista de notas com dados básicos e o total.
 
         Permite filtrar por período e tipo (entrada/saida).
         """
         c = self.conn.cursor()
         filters = []
-        params: List[str] = []
+        params: List[Any] = []
         if start_date:
             filters.append("date >= ?")
-            params.append(start_date.isoformat())
+            params.append(int(start_date.timestamp()))
         if end_date:
             filters.append("date <= ?")
-            params.append(end_date.isoformat())
+            params.append(int(end_date.timestamp()))
         if note_type in ("entrada", "saida"):
             filters.append("type = ?")
             params.append(note_type)
         where_clause = ""
         if filters:
             where_clause = "WHERE " + " AND ".join(filters)
+        # A data é convertida de epoch para texto apenas na projeção, já na
+        # fronteira com a interface.
         c.execute(
             """
-            SELECT n.id, n.key, n.date, n.type, e.name, n.total
+            SELECT n.id, n.key, datetime(n.date, 'unixepoch', 'localtime') AS date,
+                   n.type, e.name AS entity, n.total
             FROM notes n
             LEFT JOIN entities e ON n.entity_id = e.id
             {where}
@@ -581,50 +1059,41 @@ class Database:
             """.format(where=where_clause),
             params,
         )
-        rows = c.fetchall()
-        result = []
-        for row in rows:
-            result.append(
-                {
-                    "id": row[0],
-                    "key": row[1],
-                    "date": row[2],
-                    "type": row[3],
-                    "entity": row[4],
-                    "total": row[5],
-                }
-            )
-        return result
+        # As linhas sqlite3.Row já permitem acesso por nome (row["entity"]);
+        # não é necessário materializar um dicionário por nota.
+        return c.fetchall()
+
+    def get_note_items(self, note_id: int) -> List[sqlite3.Row]:
+        """Retorna todos os itens de uma nota pelo ID.
 
-    def get_note_items(self, note_id: int) -> List[Dict[str, Any]]:
-        """Retorna todos os itens de uma nota pelo ID."""
+        As colunas saem na ordem (code, description, quantity, unit_price,
+        total), de modo que as linhas podem ser consumidas por
+        desempacotamento posicional, sem busca por nome de coluna.
+        """
         c = self.conn.cursor()
         c.execute(
             """
-            SELECT p.description, ni.product_code, ni.quantity, ni.unit_price, ni.total
+            SELECT ni.product_code AS code, p.description, ni.quantity,
+                   ni.unit_price, ni.total
             FROM note_items ni
             JOIN products p ON p.code = ni.product_code
             WHERE ni.note_id = ?
             """,
             (note_id,),
         )
-        rows = c.fetchall()
-        return [
-            {
-                "description": desc,
-                "code": code,
-                "quantity": qty,
-                "unit_price": price,
-                "total": total,
-            }
-            for desc, code, qty, price, total in rows
-        ]
+        return c.fetchall()
 
-    def get_all_products(self) -> List[Tuple[str, str]]:
-        """Retorna todos os produtos cadastrados (código e descrição)."""
+    def get_all_products(self) -> Iterator[sqlite3.Row]:
+        """Gera todos os produtos cadastrados (código e descrição)."""
         c = self.conn.cursor()
         c.execute("SELECT code, description FROM products ORDER BY description")
-        return c.fetchall()
+        yield from c
+
+    def get_all_keys(self) -> Set[str]:
+        """Retorna o conjunto das chaves de todas as notas já importadas."""
+        c = self.conn.cursor()
+        c.execute("SELECT key FROM notes")
+        return {row[0] for row in c}
 
     def get_all_entities(self) -> List[Tuple[int, str]]:
         """Retorna todos os nomes de entidades (clientes/fornecedores)."""
@@ -639,8 +1108,8 @@ class Database:
         note_type: Optional[str] = None,
         product_code: Optional[str] = None,
         entity_id: Optional[int] = None,
-    ) -> List[Dict[str, Any]]:
-        """Retorna notas filtradas por período, tipo, produto e entidade.
+    ) -> Iterator[sqlite3.Row]:
+        """Gera notas filtradas por período, tipo, produto e entidade.
 
         Esta função permite realizar consultas mais refinadas do que
         query_notes, incluindo filtros por código de produto (presente
@@ -655,52 +1124,61 @@ class Database:
         :param entity_id: id da entidade para filtrar
         :return: lista de notas com dados básicos
         """
-        c = self.conn.cursor()
-        conditions = []
-        params: List[str] = []
-        join_clause = ""
+        # Memoiza o texto SQL por combinação de filtros: reutilizar a mesma
+        # string permite que o cache de comandos preparados do SQLite acerte
+        # em vez de re-planejar a consulta a cada chamada.
+        flags = (
+            bool(start_date),
+            bool(end_date),
+            note_type in ("entrada", "saida"),
+            bool(product_code),
+            bool(entity_id),
+        )
+        query = _QUERY_CACHE.get(flags)
+        if query is None:
+            conditions = []
+            if flags[0]:
+                conditions.append("n.date >= ?")
+            if flags[1]:
+                conditions.append("n.date <= ?")
+            if flags[2]:
+                conditions.append("n.type = ?")
+            if flags[4]:
+                conditions.append("n.entity_id = ?")
+            # Se filtro de produto, adiciona join com note_items
+            join_clause = ""
+            if flags[3]:
+                join_clause = "JOIN note_items ni ON ni.note_id = n.id AND ni.product_code = ?"
+            where_clause = ""
+            if conditions:
+                where_clause = "WHERE " + " AND ".join(conditions)
+            query = f"""
+                SELECT DISTINCT n.id, n.key,
+                       datetime(n.date, 'unixepoch', 'localtime') AS date,
+                       n.type, e.name AS entity, n.total
+                FROM notes n
+                LEFT JOIN entities e ON n.entity_id = e.id
+                {join_clause}
+                {where_clause}
+                ORDER BY n.date
+            """
+            _QUERY_CACHE[flags] = query
+        # Os parâmetros seguem a ordem textual dos "?": o do JOIN de produto
+        # vem antes dos filtros do WHERE.
+        params: List[Any] = []
+        if product_code:
+            params.append(product_code)
         if start_date:
-            conditions.append("n.date >= ?")
-            params.append(start_date.isoformat())
+            params.append(int(start_date.timestamp()))
         if end_date:
-            conditions.append("n.date <= ?")
-            params.append(end_date.isoformat())
+            params.append(int(end_date.timestamp()))
         if note_type in ("entrada", "saida"):
-            conditions.append("n.type = ?")
             params.append(note_type)
         if entity_id:
-            conditions.append("n.entity_id = ?")
-            params.append(str(entity_id))
-        # Se filtro de produto, adiciona join com note_items
-        if product_code:
-            join_clause = "JOIN note_items ni ON ni.note_id = n.id AND ni.product_code = ?"
-            params.append(product_code)
-        where_clause = ""
-        if conditions:
-            where_clause = "WHERE " + " AND ".join(conditions)
-        query = f"""
-            SELECT DISTINCT n.id, n.key, n.date, n.type, e.name, n.total
-            FROM notes n
-            LEFT JOIN entities e ON n.entity_id = e.id
-            {join_clause}
-            {where_clause}
-            ORDER BY n.date
-        """
+            params.append(entity_id)
+        c = self.conn.cursor()
         c.execute(query, params)
-        rows = c.fetchall()
-        result: List[Dict[str, Any]] = []
-        for row in rows:
-            result.append(
-                {
-                    "id": row[0],
-                    "key": row[1],
-                    "date": row[2],
-                    "type": row[3],
-                    "entity": row[4],
-                    "total": row[5],
-                }
-            )
-        return result
+        yield from c
 
 
 class NFeAppGUI:
@@ -712,11 +1190,48 @@ class NFeAppGUI:
         self.db = Database()
         # Cria usuário admin padrão caso não exista
         self.db.add_user("admin", "admin")
+        # Cache de resultados de consultas de leitura (ver _cached)
+        self._cache: Dict[Any, Tuple[float, Any]] = {}
+        # Chaves das notas já importadas: duplicatas em importações em
+        # massa são descartadas sem nenhuma ida ao SQLite.
+        self._known_keys: Set[str] = self.db.get_all_keys()
+        # Erros acumulados da importação corrente (ver _show_import_errors)
+        self._import_errors: List[Tuple[str, str]] = []
         # Mostra tela de login
         self.show_login_window()
         # Atributos para rastrear usuário atual e papel
         self.current_user: Optional[str] = None
         self.current_role: Optional[str] = None
+        # Permissões derivadas do papel, calculadas uma vez no login
+        self._role_flags: Dict[str, bool] = {"admin": False, "operator": False}
+        # Figure/canvas/janela do gráfico financeiro, reutilizados entre cliques
+        self._fin_fig: Optional[Any] = None
+        self._fin_canvas: Optional[Any] = None
+        self._fin_chart_win: Optional[tk.Toplevel] = None
+
+    def _cached(self, key: Any, ttl: float, fn: Callable[[], Any]) -> Any:
+        """Retorna o resultado de ``fn`` memoizado por até ``ttl`` segundos.
+
+        As consultas de leitura (estoque, resumo financeiro, produtos,
+        entidades) são refeitas a cada render de tela, mas só mudam após
+        uma importação ou cadastro; memoizá-las evita idas repetidas ao
+        SQLite entre o menu principal e as janelas de consulta.
+
+        :param key: chave do cache (inclua os parâmetros da consulta)
+        :param ttl: validade do resultado, em segundos
+        :param fn: função sem argumentos que produz o valor
+        """
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < ttl:
+            return hit[1]
+        value = fn()
+        self._cache[key] = (now, value)
+        return value
+
+    def _invalidate_cache(self) -> None:
+        """Descarta os resultados memoizados após operações de escrita."""
+        self._cache.clear()
 
     def show_login_window(self) -> None:
         """Exibe a tela de login."""
@@ -760,6 +1275,11 @@ class NFeAppGUI:
             # Armazena usuário e papel para controle de acesso
             self.current_user = username
             self.current_role = self.db.get_user_role(username)
+            # Deriva as permissões uma única vez, em vez de comparar
+            # strings de papel a cada render de tela
+            role = self.current_role or "admin"
+            is_admin = role in ("admin", "administrador")
+            self._role_flags = {"admin": is_admin, "operator": is_admin or role == "operador"}
             self.show_main_menu()
         else:
             # Falha de login
@@ -802,12 +1322,12 @@ class NFeAppGUI:
         # Resumo de estoque e finanças
         summary_frame = ttk.LabelFrame(frame, text="Resumo do Estoque e Finanças", padding=10)
         summary_frame.pack(fill="x", pady=10)
-        # Calcula indicadores
-        inventory_data = self.db.query_inventory()
-        num_products = len(inventory_data)
-        total_stock = sum(qty for _, _, qty in inventory_data)
-        negative_count = sum(1 for _, _, qty in inventory_data if qty < 0)
-        totals = self.db.query_financial_summary()
+        # Calcula indicadores: a agregação roda no SQLite e devolve apenas
+        # três escalares, em vez de trazer o estoque inteiro para o Python.
+        num_products, total_stock, negative_count = self._cached(
+            "inventory_summary", 30.0, self.db.query_inventory_summary
+        )
+        totals = self._cached("financial_summary", 30.0, self.db.query_financial_summary)
         # Cria rótulos
         ttk.Label(summary_frame, text=f"Produtos cadastrados: {num_products}").grid(row=0, column=0, sticky="w")
         ttk.Label(summary_frame, text=f"Quantidade total em estoque: {total_stock:.2f}").grid(row=1, column=0, sticky="w")
@@ -821,32 +1341,33 @@ class NFeAppGUI:
             alert_lbl.grid(row=2, column=0, sticky="w")
         # Espaçador
         ttk.Label(frame, text="").pack(pady=5)
-        # Botões de navegação
-        # Função para criar botão desabilitado se o usuário não tiver permissão
-        def add_button(parent: tk.Widget, text: str, command: Optional[Callable], allowed: bool) -> None:
-            btn = ttk.Button(parent, text=text, command=command)
-            if not allowed:
-                btn.state(["disabled"])
-            btn.pack(fill="x", pady=4)
-
-        # Verifica perfil
-        role = self.current_role or "admin"
-        is_admin = role == "admin" or role == "administrador"
-        is_operator = is_admin or role == "operador"
+        # Botões de navegação, habilitados conforme as permissões
+        # calculadas no login
+        is_admin = self._role_flags["admin"]
+        is_operator = self._role_flags["operator"]
         # Importar Notas (admin e operador)
-        add_button(frame, "Importar Notas", self.show_import_window, is_operator)
+        self._add_nav_button(frame, "Importar Notas", self.show_import_window, is_operator)
         # Consultar estoque (todos)
-        add_button(frame, "Consultar Estoque", self.show_inventory_window, True)
+        self._add_nav_button(frame, "Consultar Estoque", self.show_inventory_window, True)
         # Relatório financeiro (todos)
-        add_button(frame, "Relatório Financeiro", self.show_financial_window, True)
+        self._add_nav_button(frame, "Relatório Financeiro", self.show_financial_window, True)
         # Histórico de movimentações (todos)
-        add_button(frame, "Histórico de Movimentações", self.show_history_window, True)
+        self._add_nav_button(frame, "Histórico de Movimentações", self.show_history_window, True)
         # Cadastro de produto (admin e operador)
-        add_button(frame, "Cadastrar Produto", self.show_product_registration_window, is_operator)
+        self._add_nav_button(frame, "Cadastrar Produto", self.show_product_registration_window, is_operator)
         # Log de acessos (apenas admin)
-        add_button(frame, "Log de Acessos", self.show_access_log_window, is_admin)
+        self._add_nav_button(frame, "Log de Acessos", self.show_access_log_window, is_admin)
         # Logout
-        add_button(frame, "Logout", self.logout, True)
+        self._add_nav_button(frame, "Logout", self.logout, True)
+
+    def _add_nav_button(
+        self, parent: tk.Widget, text: str, command: Optional[Callable], allowed: bool
+    ) -> None:
+        """Cria um botão de navegação, desabilitado se o usuário não tiver permissão."""
+        btn = ttk.Button(parent, text=text, command=command)
+        if not allowed:
+            btn.state(["disabled"])
+        btn.pack(fill="x", pady=4)
 
     def clear_window(self) -> None:
         """Remove todos os widgets da janela."""
@@ -857,6 +1378,7 @@ class NFeAppGUI:
         """Efetua logout do usuário atual e retorna à tela de login."""
         self.current_user = None
         self.current_role = None
+        self._role_flags = {"admin": False, "operator": False}
         self.show_login_window()
 
     # ------------------------------------------------------------------
@@ -874,9 +1396,12 @@ class NFeAppGUI:
         win.geometry("600x400")
         frm = ttk.Frame(win, padding=10)
         frm.pack(fill="both", expand=True)
-        # Lista de caminhos selecionados
+        # Lista de caminhos selecionados; os sets espelham as listas para
+        # checar duplicatas em O(1) — a lista mantém a ordem de exibição
         selected_files: List[str] = []
+        selected_files_set: Set[str] = set()
         selected_dirs: List[str] = []
+        selected_dirs_set: Set[str] = set()
 
         # Widgets para mostrar seleção
         listbox = tk.Listbox(frm, height=8)
@@ -885,22 +1410,29 @@ class NFeAppGUI:
         def add_files() -> None:
             paths = filedialog.askopenfilenames(
                 title="Selecionar arquivos XML ou ZIP",
-                filetypes=(("Arquivos XML", "*.xml"), ("Arquivos ZIP", "*.zip"), ("Todos", "*.*")),
+                filetypes=XML_ZIP_FILETYPES,
             )
-            for p in paths:
-                if p not in selected_files:
-                    selected_files.append(p)
-                    listbox.insert(tk.END, p)
+            new_paths = [p for p in paths if p not in selected_files_set]
+            if not new_paths:
+                return
+            selected_files_set.update(new_paths)
+            selected_files.extend(new_paths)
+            # Uma única chamada variádica ao Tk em vez de um insert por
+            # caminho (centenas de idas ao Tcl em seleções grandes)
+            listbox.insert(tk.END, *new_paths)
 
         def add_directory() -> None:
             path = filedialog.askdirectory(title="Selecionar diretório contendo XMLs")
-            if path and path not in selected_dirs:
+            if path and path not in selected_dirs_set:
+                selected_dirs_set.add(path)
                 selected_dirs.append(path)
                 listbox.insert(tk.END, f"[DIR] {path}")
 
         def clear_selection() -> None:
             selected_files.clear()
+            selected_files_set.clear()
             selected_dirs.clear()
+            selected_dirs_set.clear()
             listbox.delete(0, tk.END)
 
         # Barra de progressão opcional
@@ -912,40 +1444,64 @@ class NFeAppGUI:
             if not selected_files and not selected_dirs:
                 messagebox.showwarning("Importação", "Nenhum arquivo ou diretório selecionado.")
                 return
-            # Inicializa contadores
-            total_files = len(selected_files)
-            # Estima número de XMLs em diretórios (aproximado)
+            self._import_errors.clear()
+            xml_files = [fp for fp in selected_files if fp.lower().endswith('.xml')]
+            zip_files = [fp for fp in selected_files if fp.lower().endswith('.zip')]
+            # Enumera cada diretório uma única vez: a mesma lista alimenta a
+            # barra de progresso (contagem exata, não estimada) e a
+            # importação em si.
             for d in selected_dirs:
-                for _, _, files in os.walk(d):
-                    total_files += sum(1 for f in files if f.lower().endswith('.xml'))
-            inserted = 0
-            duplicated = 0
-            errors = 0
+                xml_files.extend(iter_xml_paths(d))
+            # Inicializa contadores
+            total_files = len(xml_files) + len(zip_files)
             processed = 0
+            last_shown = 0
+            last_ui = time.monotonic()
             progress['maximum'] = max(1, total_files)
-            # Importa arquivos individuais
-            for fp in selected_files:
-                if fp.lower().endswith('.zip'):
-                    ins, dup, err = self._import_from_zip(fp)
-                elif fp.lower().endswith('.xml'):
-                    ins, dup, err = self._import_xml_file(fp)
-                else:
-                    continue
-                inserted += ins
-                duplicated += dup
-                errors += err
-                processed += ins + dup + err
-                progress['value'] = processed
-                win.update_idletasks()
-            # Importa diretórios
-            for d in selected_dirs:
-                ins, dup, err = self._import_directory(d)
-                inserted += ins
-                duplicated += dup
-                errors += err
-                processed += ins + dup + err
-                progress['value'] = processed
-                win.update_idletasks()
+
+            def tick() -> None:
+                """Avança a barra de progresso em um arquivo processado.
+
+                A atualização da tela é limitada a uma a cada 32 arquivos
+                ou 100 ms: com milhares de XMLs pequenos, redesenhar o Tk a
+                cada arquivo serializaria a importação no laço de eventos.
+                """
+                nonlocal processed, last_shown, last_ui
+                processed += 1
+                now = time.monotonic()
+                if (
+                    processed - last_shown >= 32
+                    or now - last_ui > 0.1
+                    or processed == total_files
+                ):
+                    progress['value'] = processed
+                    win.update_idletasks()
+                    last_shown = processed
+                    last_ui = now
+
+            # Toda a importação roda em uma única transação: o custo de
+            # commit/fsync passa a ser O(1) em vez de um por nota.
+            self.db.conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Importa os XMLs (avulsos e de diretórios) com parse em paralelo
+                inserted, duplicated, errors = self._import_paths(
+                    xml_files, tick, commit=False
+                )
+                # Importa arquivos ZIP
+                for fp in zip_files:
+                    ins, dup, err = self._import_from_zip(fp, commit=False)
+                    inserted += ins
+                    duplicated += dup
+                    errors += err
+                    tick()
+            except Exception:
+                self.db.conn.rollback()
+                # As chaves registradas durante a transação desfeita não
+                # estão no banco: ressincroniza o dedupe em memória para
+                # que uma nova tentativa não as trate como duplicadas
+                self._known_keys = self.db.get_all_keys()
+                raise
+            self.db.conn.commit()
             # Resultado
             parts = []
             if inserted:
@@ -954,10 +1510,16 @@ class NFeAppGUI:
                 parts.append(f"{duplicated} duplicada(s)")
             if errors:
                 parts.append(f"{errors} erro(s)")
+            # Os totais e o estoque memoizados ficaram obsoletos
+            self._invalidate_cache()
             msg = "; ".join(parts) if parts else "Nenhum arquivo processado."
             messagebox.showinfo("Importação Concluída", f"Importação finalizada: {msg}.")
             # Fecha janela após importação
             win.destroy()
+            # Uma única janela com todas as falhas, em vez de um diálogo
+            # modal por arquivo com erro
+            if self._import_errors:
+                self._show_import_errors(list(self._import_errors))
 
         # Botões
         btn_frame = ttk.Frame(frm)
@@ -967,22 +1529,70 @@ class NFeAppGUI:
         ttk.Button(btn_frame, text="Limpar Seleção", command=clear_selection).pack(side="left", padx=5)
         ttk.Button(btn_frame, text="Importar", command=perform_import).pack(side="right", padx=5)
 
-    def _import_directory(self, dir_path: str) -> Tuple[int, int, int]:
+    def _import_directory(
+        self,
+        dir_path: str,
+        on_progress: Optional[Callable[[], None]] = None,
+        commit: bool = True,
+    ) -> Tuple[int, int, int]:
         """Importa todos os arquivos XML dentro de um diretório recursivamente.
 
+        :return: tupla (inseridos, duplicados, erros)
+        """
+        return self._import_paths(list(iter_xml_paths(dir_path)), on_progress, commit=commit)
+
+    def _insert_parsed_note(self, parsed: ParsedNote, commit: bool = True) -> bool:
+        """Insere uma nota já parseada, com dedupe em memória pela chave.
+
+        :param commit: repassado a Database.insert_note
+        :return: True se a nota foi inserida, False se era duplicada
+        """
+        if parsed.key in self._known_keys:
+            return False
+        inserted = self.db.insert_note(parsed, commit=commit)
+        # Registra a chave mesmo quando a nota já estava no banco
+        self._known_keys.add(parsed.key)
+        return inserted
+
+    def _import_paths(
+        self,
+        paths: List[str],
+        on_progress: Optional[Callable[[], None]] = None,
+        commit: bool = True,
+    ) -> Tuple[int, int, int]:
+        """Importa uma lista de arquivos XML com parse em paralelo.
+
+        O parse roda em um pool de threads — com lxml o GIL é liberado
+        durante o parse e o ganho escala com os núcleos; com o parser do
+        stdlib ainda há sobreposição de I/O. As inserções permanecem na
+        thread chamadora, respeitando o modelo de escritor único do SQLite.
+
+        :param paths: caminhos de arquivos XML
+        :param on_progress: callback opcional chamado após cada arquivo
         :return: tupla (inseridos, duplicados, erros)
         """
         inserted = 0
         duplicated = 0
         errors = 0
-        for root_dir, _, files in os.walk(dir_path):
-            for fname in files:
-                if fname.lower().endswith('.xml'):
-                    fpath = os.path.join(root_dir, fname)
-                    ins, dup, err = self._import_xml_file(fpath)
-                    inserted += ins
-                    duplicated += dup
-                    errors += err
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as ex:
+            futures = {ex.submit(parse_xml_notes_list, p): p for p in paths}
+            for fut in as_completed(futures):
+                path = futures[fut]
+                try:
+                    parsed_notes = fut.result()
+                except Exception as e:
+                    # Acumula em vez de abrir um diálogo modal por falha
+                    self._import_errors.append((path, str(e)))
+                    errors += 1
+                else:
+                    # Lotes consolidados trazem várias notas por arquivo
+                    for parsed in parsed_notes:
+                        if self._insert_parsed_note(parsed, commit=commit):
+                            inserted += 1
+                        else:
+                            duplicated += 1
+                if on_progress:
+                    on_progress()
         return inserted, duplicated, errors
 
     # ------------------------------------------------------------------
@@ -1024,6 +1634,7 @@ class NFeAppGUI:
             if qty != 0:
                 self.db.update_inventory(code, qty, "entrada")
             self.db.conn.commit()
+            self._invalidate_cache()
             result_lbl.config(text="Produto cadastrado/atualizado com sucesso.")
             # Limpa campos
             code_entry.delete(0, tk.END)
@@ -1037,8 +1648,7 @@ class NFeAppGUI:
     def show_access_log_window(self) -> None:
         """Mostra uma janela com o log de tentativas de login (somente admin)."""
         # Apenas administradores podem acessar
-        role = self.current_role or ""
-        if role not in ("admin", "administrador"):
+        if not self._role_flags["admin"]:
             messagebox.showwarning("Acesso negado", "Somente administradores podem ver o log de acessos.")
             return
         win = tk.Toplevel(self.master)
@@ -1066,26 +1676,20 @@ class NFeAppGUI:
             tree.insert("", "end", values=(username, ts.replace("T", " "), status))
         # Exportação opcional
         def export_logs() -> None:
-            if not HAS_PANDAS:
-                messagebox.showerror("Exportação indisponível", "A biblioteca pandas não está disponível.")
-                return
-            import pandas as pd
-            df = pd.DataFrame(logs, columns=["Usuário", "Data/Hora", "Sucesso"])
             file_path = filedialog.asksaveasfilename(
                 title="Salvar log de acessos",
                 defaultextension=".csv",
-                filetypes=(("CSV", "*.csv"), ("Excel", "*.xlsx"), ("PDF", "*.pdf")),
+                filetypes=EXPORT_FILETYPES,
             )
             if not file_path:
                 return
             try:
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext == ".xlsx":
-                    df.to_excel(file_path, index=False)
-                elif ext == ".pdf":
-                    export_dataframe_to_pdf(df, file_path, title="Log de Acessos")
-                else:
-                    df.to_csv(file_path, index=False, sep=';')
+                export_table(
+                    file_path,
+                    ["Usuário", "Data/Hora", "Sucesso"],
+                    logs,
+                    title="Log de Acessos",
+                )
                 messagebox.showinfo("Exportação", f"Log salvo em {file_path}.")
             except Exception as e:
                 messagebox.showerror("Erro na exportação", f"Não foi possível exportar: {e}")
@@ -1099,27 +1703,34 @@ class NFeAppGUI:
         """
         file_paths = filedialog.askopenfilenames(
             title="Selecione arquivos XML ou ZIP",
-            filetypes=(
-                ("Arquivos XML", "*.xml"),
-                ("Arquivos ZIP", "*.zip"),
-                ("Todos os arquivos", "*.*"),
-            ),
+            filetypes=XML_ZIP_FILETYPES,
         )
         if not file_paths:
             return
+        self._import_errors.clear()
         inserted = 0
         duplicated = 0
         errors = 0
-        for path in file_paths:
-            if path.lower().endswith('.zip'):
-                ins, dup, err = self._import_from_zip(path)
-            elif path.lower().endswith('.xml'):
-                ins, dup, err = self._import_xml_file(path)
-            else:
-                continue
-            inserted += ins
-            duplicated += dup
-            errors += err
+        # Uma única transação para todos os arquivos selecionados
+        self.db.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for path in file_paths:
+                if path.lower().endswith('.zip'):
+                    ins, dup, err = self._import_from_zip(path, commit=False)
+                elif path.lower().endswith('.xml'):
+                    ins, dup, err = self._import_xml_file(path, commit=False)
+                else:
+                    continue
+                inserted += ins
+                duplicated += dup
+                errors += err
+        except Exception:
+            self.db.conn.rollback()
+            # Chaves adicionadas na transação desfeita saem do dedupe em
+            # memória, senão a nova tentativa as veria como duplicadas
+            self._known_keys = self.db.get_all_keys()
+            raise
+        self.db.conn.commit()
         # Construir mensagem de resumo
         parts = []
         if inserted:
@@ -1128,14 +1739,69 @@ class NFeAppGUI:
             parts.append(f"{duplicated} nota(s) duplicada(s) ignorada(s)")
         if errors:
             parts.append(f"{errors} arquivo(s) com erro")
+        self._invalidate_cache()
         msg = "; ".join(parts) if parts else "Nenhum arquivo processado."
         messagebox.showinfo(
             "Importação Concluída",
             f"Importação finalizada. {msg}",
         )
+        if self._import_errors:
+            self._show_import_errors(list(self._import_errors))
+
+    def _show_import_errors(self, errors: List[Tuple[str, str]]) -> None:
+        """Exibe em uma única janela todos os erros da importação.
 
-    def _import_from_zip(self, zip_path: str) -> Tuple[int, int, int]:
-        """Extrai e importa notas de um arquivo ZIP.
+        Substitui o diálogo modal por arquivo com erro: em lotes grandes
+        cada messagebox bloqueava a importação até o clique do usuário.
+
+        :param errors: lista de tuplas (arquivo, mensagem de erro)
+        """
+        win = tk.Toplevel(self.master)
+        win.title("Erros de Importação")
+        win.geometry("700x400")
+        frame = ttk.Frame(win, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+        ttk.Label(
+            frame,
+            text=f"{len(errors)} arquivo(s) não puderam ser importados:",
+        ).pack(anchor=tk.W, pady=(0, 5))
+        columns = ("Arquivo", "Erro")
+        tree = ttk.Treeview(frame, columns=columns, show="headings")
+        tree.heading("Arquivo", text="Arquivo")
+        tree.heading("Erro", text="Erro")
+        tree.column("Arquivo", width=300)
+        tree.column("Erro", width=350)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=tree.yview)
+        tree.configure(yscroll=scrollbar.set)
+        for path, message in errors:
+            tree.insert("", tk.END, values=(path, message))
+        tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def export_errors() -> None:
+            file_path = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=(("Arquivos CSV", "*.csv"),),
+                title="Salvar log de erros",
+            )
+            if not file_path:
+                return
+            import csv
+            with open(file_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f, delimiter=";")
+                writer.writerow(("Arquivo", "Erro"))
+                writer.writerows(errors)
+            messagebox.showinfo("Exportar", f"Log de erros salvo em {file_path}")
+
+        ttk.Button(win, text="Exportar Erros", command=export_errors).pack(pady=5)
+
+    def _import_from_zip(self, zip_path: str, commit: bool = True) -> Tuple[int, int, int]:
+        """Importa notas diretamente dos membros XML de um arquivo ZIP.
+
+        Cada membro é lido para a memória e alimenta o parser sem passar
+        por um diretório temporário, evitando o dobro de I/O (gravar e
+        reler cada arquivo) da abordagem com extração em disco. Membros
+        vazios são ignorados de antemão.
 
         :param zip_path: Caminho do arquivo ZIP
         :return: tupla (inseridos, duplicados, erros)
@@ -1144,35 +1810,42 @@ class NFeAppGUI:
         duplicated = 0
         errors = 0
         with zipfile.ZipFile(zip_path, 'r') as zf:
-            # Extrai para um diretório temporário
-            with tempfile.TemporaryDirectory() as tmpdir:
-                zf.extractall(tmpdir)
-                for root_dir, _, files in os.walk(tmpdir):
-                    for fname in files:
-                        if fname.lower().endswith('.xml'):
-                            fpath = os.path.join(root_dir, fname)
-                            ins, dup, err = self._import_xml_file(fpath)
-                            inserted += ins
-                            duplicated += dup
-                            errors += err
+            for info in zf.infolist():
+                if not info.filename.lower().endswith('.xml') or info.file_size == 0:
+                    continue
+                try:
+                    # Itera todas as notas do membro: lotes consolidados
+                    # dentro do ZIP também inserem nota a nota
+                    for parsed in _iter_xml_source(io.BytesIO(zf.read(info)), info.filename):
+                        if self._insert_parsed_note(parsed, commit=commit):
+                            inserted += 1
+                        else:
+                            duplicated += 1
+                except Exception as e:
+                    self._import_errors.append((info.filename, str(e)))
+                    errors += 1
         return inserted, duplicated, errors
 
-    def _import_xml_file(self, xml_path: str) -> Tuple[int, int, int]:
-        """Importa uma única nota XML.
+    def _import_xml_file(self, xml_path: str, commit: bool = True) -> Tuple[int, int, int]:
+        """Importa as notas de um arquivo XML (uma ou várias, em lotes).
 
         :param xml_path: Caminho do arquivo XML
         :return: tupla (inseridos, duplicados, erros)
         """
+        inserted = 0
+        duplicated = 0
         try:
-            parsed = parse_xml_file(xml_path)
-            inserted = self.db.insert_note(parsed)
-            return (1 if inserted else 0, 0 if inserted else 1, 0)
+            # parse_xml_notes é um gerador: lotes com várias NF-e são
+            # inseridos nota a nota, com memória constante
+            for parsed in parse_xml_notes(xml_path):
+                if self._insert_parsed_note(parsed, commit=commit):
+                    inserted += 1
+                else:
+                    duplicated += 1
+            return (inserted, duplicated, 0)
         except Exception as e:
-            messagebox.showerror(
-                "Erro ao importar XML",
-                f"Não foi possível importar {os.path.basename(xml_path)}:\n{e}",
-            )
-            return (0, 0, 1)
+            self._import_errors.append((xml_path, str(e)))
+            return (inserted, duplicated, 1)
 
     def show_inventory_window(self) -> None:
         """Exibe uma janela com o estoque atual."""
@@ -1191,13 +1864,21 @@ class NFeAppGUI:
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
         tree.configure(yscroll=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
-        tree.pack(fill="both", expand=True)
-        # Preenche dados
-        # Configura tag para valores negativos
+        # Preenche dados antes de exibir a árvore: com o widget ainda fora
+        # do layout, o Tk não recalcula a geometria a cada inserção. As
+        # linhas são pré-formatadas fora do laço de inserção.
         tree.tag_configure("negativo", foreground="red")
-        for code, desc, qty in self.db.query_inventory():
-            tags = ("negativo",) if qty < 0 else ()
-            tree.insert("", "end", values=(code, desc, f"{qty:.2f}"), tags=tags)
+        inventory_data = self._cached(
+            "inventory", 30.0, lambda: list(self.db.query_inventory())
+        )
+        rows = [
+            ((code, desc, f"{qty:.2f}"), ("negativo",) if qty < 0 else ())
+            for code, desc, qty in inventory_data
+        ]
+        insert = tree.insert
+        for values, tags in rows:
+            insert("", "end", values=values, tags=tags)
+        tree.pack(fill="both", expand=True)
 
     def show_financial_window(self) -> None:
         """Abre uma janela para selecionar período e visualizar o balanço.
@@ -1223,7 +1904,7 @@ class NFeAppGUI:
 
         # Variável para armazenar último resumo calculado
         summary: Dict[str, float] = {"entrada": 0.0, "saida": 0.0, "saldo": 0.0}
-        current_notes: List[Dict[str, any]] = []
+        current_notes: List[sqlite3.Row] = []
 
         def calculate() -> None:
             """Calcula os totais de notas para o período selecionado."""
@@ -1241,7 +1922,11 @@ class NFeAppGUI:
                 return
             # Atualiza resumo
             nonlocal summary, current_notes
-            summary = self.db.query_financial_summary(start_dt, end_dt)
+            summary = self._cached(
+                ("financial_summary", s_date, e_date),
+                30.0,
+                lambda: self.db.query_financial_summary(start_dt, end_dt),
+            )
             result_lbl.config(
                 text=(
                     f"Entradas: R$ {summary['entrada']:.2f}\n"
@@ -1260,26 +1945,31 @@ class NFeAppGUI:
             # Recalcula se necessário
             if not (summary['entrada'] or summary['saida'] or summary['saldo']):
                 calculate()
-            try:
-                import matplotlib.pyplot as plt
-                from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-            except ImportError:
+            mpl = _ensure_matplotlib()
+            if mpl is None:
                 messagebox.showerror("Biblioteca faltando", "Matplotlib não está disponível.")
                 return
+            Figure, FigureCanvasTkAgg = mpl
             # Dados para gráfico
             categories = ["Entradas", "Saídas", "Saldo"]
             values = [summary['entrada'], summary['saida'], summary['saldo']]
-            # Cria figura
-            fig, ax = plt.subplots()
+            # Reutiliza a mesma Figure/janela entre cliques: alocar uma
+            # figura nova por clique acumularia figuras órfãs na memória
+            chart_win = self._fin_chart_win
+            if chart_win is None or not chart_win.winfo_exists():
+                chart_win = tk.Toplevel(win)
+                chart_win.title("Gráfico Financeiro")
+                self._fin_fig = Figure()
+                self._fin_canvas = FigureCanvasTkAgg(self._fin_fig, master=chart_win)
+                self._fin_canvas.get_tk_widget().pack(fill="both", expand=True)
+                self._fin_chart_win = chart_win
+            fig = self._fin_fig
+            ax = fig.axes[0] if fig.axes else fig.add_subplot(111)
+            ax.clear()
             ax.bar(categories, values)
             ax.set_title("Resumo Financeiro")
-            # Mostra gráfico em nova janela Tkinter
-            chart_win = tk.Toplevel(win)
-            chart_win.title("Gráfico Financeiro")
-            canvas = FigureCanvasTkAgg(fig, master=chart_win)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
-            plt.close(fig)
+            self._fin_canvas.draw_idle()
+            chart_win.lift()
 
         chart_btn = ttk.Button(frame, text="Exibir Gráfico", command=show_chart)
         chart_btn.grid(row=3, column=0, pady=5)
@@ -1289,33 +1979,23 @@ class NFeAppGUI:
             if not current_notes:
                 messagebox.showinfo("Exportação", "Nenhuma nota para exportar.")
                 return
-            if not HAS_PANDAS:
-                messagebox.showerror(
-                    "Exportação indisponível", "A biblioteca pandas não está disponível.")
-                return
-            import pandas as pd  # Garantir import local
-            df = pd.DataFrame(current_notes)
             # Pergunta formato
             file_path = filedialog.asksaveasfilename(
                 title="Salvar relatório",
                 defaultextension=".csv",
-                filetypes=(
-                    ("CSV", "*.csv"),
-                    ("Excel", "*.xlsx"),
-                    ("PDF", "*.pdf"),
-                ),
+                filetypes=EXPORT_FILETYPES,
             )
             if not file_path:
                 return
             try:
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext == ".xlsx":
-                    df.to_excel(file_path, index=False)
-                elif ext == ".pdf":
-                    # Exporta para PDF usando matplotlib
-                    export_dataframe_to_pdf(df, file_path, title="Relatório Financeiro")
-                else:
-                    df.to_csv(file_path, index=False, sep=';')
+                # As linhas sqlite3.Row já se comportam como tuplas; os
+                # nomes das colunas vêm da própria consulta.
+                export_table(
+                    file_path,
+                    current_notes[0].keys(),
+                    current_notes,
+                    title="Relatório Financeiro",
+                )
                 messagebox.showinfo("Exportação", f"Relatório salvo em {file_path}.")
             except Exception as e:
                 messagebox.showerror("Erro na exportação", f"Não foi possível exportar: {e}")
@@ -1344,14 +2024,21 @@ class NFeAppGUI:
         # Filtro de produto
         ttk.Label(frame, text="Produto:").grid(row=1, column=2, sticky="e")
         # Carrega lista de produtos (somente códigos) com descrições
-        products = self.db.get_all_products()
+        products = self._cached(
+            "products", 30.0, lambda: list(self.db.get_all_products())
+        )
         prod_values = [""] + [f"{code} - {desc}" for code, desc in products]
         prod_combo = ttk.Combobox(frame, values=prod_values, state="readonly")
         prod_combo.grid(row=1, column=3, pady=5, sticky="w")
         prod_combo.set("")
         # Filtro de entidade
         ttk.Label(frame, text="Entidade:").grid(row=2, column=0, sticky="e")
-        entities = self.db.get_all_entities()
+        entities = self._cached(
+            "entities", 30.0, lambda: list(self.db.get_all_entities())
+        )
+        # Mapa nome->id construído uma vez: o filtro resolve a entidade em
+        # O(1) em vez de varrer a lista a cada clique.
+        ent_name_to_id = {name: eid for eid, name in entities}
         ent_values = [""] + [name for _, name in entities]
         ent_combo = ttk.Combobox(frame, values=ent_values, state="readonly")
         ent_combo.grid(row=2, column=1, pady=5, sticky="w")
@@ -1400,28 +2087,29 @@ class NFeAppGUI:
                 product_code = prod_sel.split(" - ")[0]
             # Entidade
             ent_sel = ent_combo.get()
-            entity_id = None
-            if ent_sel:
-                # Find id by name
-                for eid, name in entities:
-                    if name == ent_sel:
-                        entity_id = eid
-                        break
-            # Consulta
-            notes = self.db.query_notes_filtered(
-                start_dt, end_dt, note_t, product_code, entity_id
-            )
-            # Atualiza tabela
+            entity_id = ent_name_to_id.get(ent_sel) if ent_sel else None
+            # Consulta (gerador: conta durante a própria inserção). A árvore
+            # é retirada do grid durante a carga para o Tk reposicionar o
+            # layout uma única vez ao final.
+            count = 0
+            tree.grid_remove()
             tree.delete(*tree.get_children())
-            for note in notes:
-                tree.insert(
+            insert = tree.insert
+            for note in self.db.query_notes_filtered(
+                start_dt, end_dt, note_t, product_code, entity_id
+            ):
+                insert(
                     "",
                     "end",
-                    iid=note["id"],
+                    # Invariante: o iid de cada linha é str(id) da nota;
+                    # on_double_click depende disso para converter direto
+                    iid=str(note["id"]),
                     values=(note["date"][:10], note["type"], note["entity"], f"{note['total']:.2f}"),
                 )
+                count += 1
+            tree.grid()
             # Atualiza label de contagem
-            result_info.config(text=f"Exibindo {len(notes)} movimentação(ões)")
+            result_info.config(text=f"Exibindo {count} movimentação(ões)")
 
         # Função para limpar filtros
         def clear_filters() -> None:
@@ -1439,37 +2127,38 @@ class NFeAppGUI:
 
         # Exportação
         def export_history() -> None:
-            # Gera DataFrame das notas atualmente exibidas
-            if not HAS_PANDAS:
-                messagebox.showerror("Exportação indisponível", "A biblioteca pandas não está disponível.")
-                return
-            items = []
-            for iid in tree.get_children():
-                vals = tree.item(iid)["values"]
-                items.append({"Data": vals[0], "Tipo": vals[1], "Entidade": vals[2], "Total": vals[3]})
-            if not items:
+            # Exporta as notas atualmente exibidas na árvore
+            rows = [tree.item(iid)["values"] for iid in tree.get_children()]
+            if not rows:
                 messagebox.showinfo("Exportação", "Nenhuma movimentação para exportar.")
                 return
-            import pandas as pd
-            df = pd.DataFrame(items)
             file_path = filedialog.asksaveasfilename(
                 title="Salvar histórico",
                 defaultextension=".csv",
-                filetypes=(("CSV", "*.csv"), ("Excel", "*.xlsx"), ("PDF", "*.pdf")),
+                filetypes=EXPORT_FILETYPES,
             )
             if not file_path:
                 return
-            try:
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext == ".xlsx":
-                    df.to_excel(file_path, index=False)
-                elif ext == ".pdf":
-                    export_dataframe_to_pdf(df, file_path, title="Histórico de Movimentações")
+
+            # A escrita roda fora da thread do Tk para não congelar a
+            # interface em exportações grandes; o resultado volta ao laço
+            # de eventos via after (widgets Tk só na thread principal)
+            def _do_export() -> None:
+                try:
+                    export_table(
+                        file_path,
+                        ["Data", "Tipo", "Entidade", "Total"],
+                        rows,
+                        title="Histórico de Movimentações",
+                    )
+                except Exception as e:
+                    self.master.after(0, lambda err=e: messagebox.showerror(
+                        "Erro na exportação", f"Não foi possível exportar: {err}"))
                 else:
-                    df.to_csv(file_path, index=False, sep=';')
-                messagebox.showinfo("Exportação", f"Histórico salvo em {file_path}.")
-            except Exception as e:
-                messagebox.showerror("Erro na exportação", f"Não foi possível exportar: {e}")
+                    self.master.after(0, lambda: messagebox.showinfo(
+                        "Exportação", f"Histórico salvo em {file_path}."))
+
+            threading.Thread(target=_do_export, daemon=True).start()
 
         ttk.Button(frame, text="Exportar", command=export_history).grid(row=3, column=0, pady=5, sticky="w")
 
@@ -1478,42 +2167,82 @@ class NFeAppGUI:
             item_id = tree.focus()
             if not item_id:
                 return
-            try:
-                note_id = int(item_id)
-            except ValueError:
-                return
-            items = self.db.get_note_items(note_id)
-            self._show_items_window(items)
+            # Toda linha é inserida com iid=str(note_id) em refresh(), então
+            # a conversão nunca falha e dispensa o try/except no caminho
+            # do evento
+            note_id = int(item_id)
+
+            # A consulta roda fora da thread do Tk; a janela com os itens
+            # abre via after quando o resultado chega, sem travar a UI em
+            # notas com muitos itens
+            def worker() -> None:
+                # Itens de notas já gravadas são imutáveis: duplo cliques
+                # repetidos na mesma nota reusam o resultado memoizado
+                items = self._cached(
+                    ("note_items", note_id),
+                    60.0,
+                    lambda: self.db.get_note_items(note_id),
+                )
+                self.master.after(0, lambda: self._show_items_window(items))
+
+            threading.Thread(target=worker, daemon=True).start()
         tree.bind("<Double-1>", on_double_click)
 
-    def _show_items_window(self, items: List[Dict[str, any]]) -> None:
-        """Mostra uma janela com os itens de uma nota."""
+    def _show_items_window(self, items: Iterable[Sequence[Any]]) -> None:
+        """Mostra uma janela com os itens de uma nota.
+
+        :param items: linhas (code, description, quantity, unit_price, total)
+        """
+        # Formata todas as linhas de uma vez, desempacotando por posição
+        # (sem as cinco buscas por nome de coluna por linha); o laço de
+        # inserção usa o método insert já resolvido
+        fmt = "{:.2f}".format
+        rows = [
+            (code, description, fmt(quantity), fmt(unit_price), fmt(total))
+            for code, description, quantity, unit_price, total in items
+        ]
+        # Sem itens não há o que montar: um aviso simples substitui a
+        # construção da janela inteira
+        if not rows:
+            messagebox.showinfo("Itens da Nota", "Esta nota não possui itens.")
+            return
         win = tk.Toplevel(self.master)
         win.title("Itens da Nota")
         win.geometry("600x400")
         frame = ttk.Frame(win, padding=10)
         frame.pack(fill="both", expand=True)
-        columns = ("Código", "Descrição", "Quantidade", "Preço Unit.", "Total")
-        tree = ttk.Treeview(frame, columns=columns, show="headings")
-        for col in columns:
+        tree = ttk.Treeview(frame, columns=ITEM_COLUMNS, show="headings")
+        for col in ITEM_COLUMNS:
             tree.heading(col, text=col)
-            tree.column(col, width=110 if col != "Descrição" else 200, anchor="center")
+            tree.column(col, width=ITEM_COLUMN_WIDTHS.get(col, 110), anchor="center")
         scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
         tree.configure(yscroll=scrollbar.set)
         scrollbar.pack(side="right", fill="y")
+        insert = tree.insert
+        # Carregamento sob demanda: só um bloco de linhas é inserido por
+        # vez e os próximos entram conforme o usuário rola — em notas com
+        # milhares de itens a abertura da janela passa a custar O(bloco)
+        chunk_size = 200
+        next_row = 0
+
+        def load_chunk() -> None:
+            nonlocal next_row
+            end = min(next_row + chunk_size, len(rows))
+            for values in rows[next_row:end]:
+                insert("", "end", values=values)
+            next_row = end
+
+        def on_yscroll(first: str, last: str) -> None:
+            scrollbar.set(first, last)
+            # Perto do fim do trecho já carregado: insere o próximo bloco
+            if next_row < len(rows) and float(last) > 0.9:
+                load_chunk()
+
+        tree.configure(yscroll=on_yscroll)
+        # O primeiro bloco entra com o widget ainda fora do layout, sem
+        # recálculo de geometria por linha
+        load_chunk()
         tree.pack(fill="both", expand=True)
-        for item in items:
-            tree.insert(
-                "",
-                "end",
-                values=(
-                    item["code"],
-                    item["description"],
-                    f"{item['quantity']:.2f}",
-                    f"{item['unit_price']:.2f}",
-                    f"{item['total']:.2f}",
-                ),
-            )
 
 
 def main() -> None:
@@ -1521,7 +2250,9 @@ def main() -> None:
     root = tk.Tk()
     # Definimos um estilo mais agradável
     style = ttk.Style()
-    if "clam" in style.theme_names():
+    # Uma única ida ao Tcl para listar os temas disponíveis
+    theme_names = style.theme_names()
+    if "clam" in theme_names:
         style.theme_use("clam")
     NFeAppGUI(root)
     root.mainloop()